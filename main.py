@@ -1,20 +1,43 @@
 import os
 import json
+import asyncio
 import logging
+import re
+import threading
+import time
 from datetime import datetime, timedelta
+from functools import lru_cache, partial
 from typing import Dict, List
 
+import numpy as np
 from dotenv import load_dotenv
 from telegram import Update
 from telegram.ext import ApplicationBuilder, CommandHandler, ContextTypes
 
 try:
     from google.oauth2 import service_account
+    from google_auth_httplib2 import AuthorizedHttp
     from googleapiclient.discovery import build
+    from googleapiclient.http import build_http
 except ImportError:
     service_account = None
     build = None
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
 logging.basicConfig(
     format='%(asctime)s %(name)s %(levelname)s %(message)s',
     level=logging.INFO,
@@ -27,6 +50,10 @@ BOT_TOKEN = os.getenv('TELEGRAM_BOT_TOKEN')
 SHEETS_IDS = [s.strip() for s in os.getenv('SHEETS_IDS', '').split(',') if s.strip()]
 SERVICE_ACCOUNT_JSON = os.getenv('GOOGLE_SERVICE_ACCOUNT_JSON')
 DEFAULT_USER = os.getenv('DEFAULT_USER_NAME', '').strip()
+# Set DEBUG_ROWS=1 to log every matched row while scanning sheets.
+_DEBUG_ROWS = os.getenv('DEBUG_ROWS') == '1'
+if _DEBUG_ROWS:
+    logger.setLevel(logging.DEBUG)
 
 # Map Google sheets to display-ready model names for breakdown output.
 MODEL_NAMES = ['Kensley', 'Skyler', 'Mila']
@@ -41,9 +68,28 @@ logger.info(
     SERVICE_ACCOUNT_JSON or 'not set'
 )
 
+
+def _service_disabled_reason() -> str | None:
+    """Explain why Google Sheets access cannot work, or None if it is configured"""
+    if not SERVICE_ACCOUNT_JSON or not os.path.exists(SERVICE_ACCOUNT_JSON):
+        logger.warning('Service account JSON missing; sheet lookups are disabled')
+        return 'Service account not configured'
+    if not service_account or not build:
+        logger.error('google-api-python-client not installed; sheet lookups are disabled')
+        return 'Google API client not installed'
+    return None
+
+
+# Checked once at startup; also set later if building the Sheets service fails.
+_SERVICE_DISABLED_REASON = _service_disabled_reason()
+
 DATA_DIR = os.path.join(os.path.dirname(__file__), 'data')
 USERS_FILE = os.path.join(DATA_DIR, 'users.json')
 
+# In-memory copy of users.json, refreshed only when the file's mtime changes.
+_USER_MAP_CACHE: Dict[str, str] | None = None
+_USER_MAP_MTIME: float = 0
+
 # FIXED: Updated configurations with correct date formats and column indices
 SHEET_CONFIGS = {
     '1MlIztcbS1hR-gMnT9aOtH5LMALcIOLCUL08o1SMsePg': {
@@ -67,11 +113,228 @@ SHEET_CONFIGS = {
 }
 DEFAULT_CONFIG = {'name_idx': 0, 'date_idx': 3, 'sale_idx': 5, 'formats': ['%b %d, %Y, %I:%M:%S %p', '%B %d, %Y', '%Y-%m-%d']}
 
+# Precompiled patterns for the date layouts the sheets actually use. Building the
+# datetime from captured ints avoids strptime's per-call format parsing.
+_MONTH_NAMES = (
+    'January', 'February', 'March', 'April', 'May', 'June',
+    'July', 'August', 'September', 'October', 'November', 'December',
+)
+# Full and abbreviated names, in both sheet casing ("Nov") and lowercase
+_MONTHS = {
+    key: number
+    for number, month in enumerate(_MONTH_NAMES, 1)
+    for key in (month, month[:3], month.lower(), month[:3].lower())
+}
+# %B and %b only accept full and abbreviated names respectively, so the patterns
+# keep them apart to accept exactly what the matching strptime format does.
+_FULL_MONTH = '|'.join(_MONTH_NAMES)
+_ABBR_MONTH = '|'.join(month[:3] for month in _MONTH_NAMES)
+# "Nov 15, 2025, 5:08:33 PM"
+_NOV15_PATTERN = (
+    r'^(?P<mon>{months}) (?P<d>\d{{1,2}}), (?P<y>\d{{4}}), '
+    r'(?P<h>\d{{1,2}}):(?P<mi>\d{{2}}):(?P<s>\d{{2}}) (?P<ap>[AP]M)$'
+)
+# "Nov 15, 2025"
+_MONTH_DATE_PATTERN = r'^(?P<mon>{months}) (?P<d>\d{{1,2}}), (?P<y>\d{{4}})$'
+
+# Precompiled equivalent of each config strptime format that has one
+_FORMAT_REGEXES = {
+    '%b %d, %Y, %I:%M:%S %p': re.compile(_NOV15_PATTERN.format(months=_ABBR_MONTH), re.IGNORECASE),
+    '%B %d, %Y, %I:%M:%S %p': re.compile(_NOV15_PATTERN.format(months=_FULL_MONTH), re.IGNORECASE),
+    '%b %d, %Y': re.compile(_MONTH_DATE_PATTERN.format(months=_ABBR_MONTH), re.IGNORECASE),
+    '%B %d, %Y': re.compile(_MONTH_DATE_PATTERN.format(months=_FULL_MONTH), re.IGNORECASE),
+    # "2025-11-15"
+    '%Y-%m-%d': re.compile(r'^(?P<y>\d{4})-(?P<m>\d{1,2})-(?P<d>\d{1,2})$'),
+}
+
+# Used by parse_sheet_date to normalise free-form dates before probing formats.
+_GMT_RE = re.compile(r' GMT.*$')
+_ORDINAL_RE = re.compile(r'(\d+)(?:st|nd|rd|th)\b')
+# Every format parse_sheet_date can handle contains a 4-digit year
+_YEAR_RE = re.compile(r'\d{4}')
+_FALLBACK_FORMATS = (
+    '%B %d, %Y at %I:%M %p',   # August 6, 2025 at 5:52 PM (after removing "th" and "GMT+8")
+    '%b %d, %Y at %I:%M %p',   # Aug 6, 2025 at 5:52 PM
+    '%b %d, %Y, %I:%M:%S %p',  # Nov 15, 2025, 5:08:33 PM
+    '%B %d, %Y, %I:%M:%S %p',  # November 15, 2025, 5:08:33 PM
+    '%Y-%m-%d',                # 2025-11-15
+    '%Y/%m/%d',                # 2025/11/15
+    '%m/%d/%Y',                # 11/15/2025
+    '%d/%m/%Y',                # 15/11/2025
+    '%Y-%m-%d %H:%M',
+    '%Y/%m/%d %H:%M',
+)
+
+
+def _build_datetime(year: str, month_name: str, day: str, hour: str, minute: str, second: str, ampm: str):
+    """Assemble a datetime from 12-hour clock fields; None if any field is invalid"""
+    month = _MONTHS.get(month_name) or _MONTHS.get(month_name.lower())
+    ampm = ampm.upper()
+    if not month or ampm not in ('AM', 'PM'):
+        return None
+    hour = int(hour)
+    if not 1 <= hour <= 12:
+        return None
+    hour = hour % 12 + (12 if ampm == 'PM' else 0)
+    return datetime(int(year), month, int(day), hour, int(minute), int(second))
+
+
+def _parse_nov15_format(value: str):
+    """Parse "Nov 15, 2025, 5:08:33 PM" by splitting; None if the shape differs"""
+    try:
+        month_day, year, clock = value.split(', ')
+        month_name, day = month_day.split(' ')
+        hms, ampm = clock.split(' ')
+        hour, minute, second = hms.split(':')
+        return _build_datetime(year, month_name, day, hour, minute, second, ampm)
+    except ValueError:
+        return None
+
+
+def _parse_aug6_format(value: str):
+    """Parse "August 6th, 2025 at 5:52 PM GMT+8" by splitting; None if the shape differs"""
+    try:
+        month_day, rest = value.split(', ', 1)
+        month_name, day = month_day.split(' ')
+        year, at, hm, ampm, *tz = rest.split(' ')
+        if at != 'at' or (tz and (len(tz) > 1 or not tz[0].startswith('GMT'))):
+            return None
+        hour, minute = hm.split(':')
+        if day[-2:] in ('st', 'nd', 'rd', 'th'):
+            day = day[:-2]
+        return _build_datetime(year, month_name, day, hour, minute, '0', ampm)
+    except ValueError:
+        return None
+
+
+SHEET_CONFIGS['1MlIztcbS1hR-gMnT9aOtH5LMALcIOLCUL08o1SMsePg']['fast_parse'] = _parse_nov15_format
+SHEET_CONFIGS['1Q0VkLwxwKTc_-t17Ij-t_rI-wtwdLE37FyUjkznCYrI']['fast_parse'] = _parse_aug6_format
+
+# strptime formats each split-based parser already handles, so their regexes are skipped
+_FAST_PARSE_FORMATS = {
+    _parse_nov15_format: ('%b %d, %Y, %I:%M:%S %p', '%B %d, %Y, %I:%M:%S %p'),
+}
+
+
+def _config_regexes(conf: Dict) -> tuple:
+    """Regexes for a config's own formats, in config order, minus fast_parse's"""
+    covered = _FAST_PARSE_FORMATS.get(conf.get('fast_parse'), ())
+    return tuple(
+        _FORMAT_REGEXES[fmt]
+        for fmt in conf.get('formats', ())
+        if fmt in _FORMAT_REGEXES and fmt not in covered
+    )
+
+
+_SHEET_REGEXES = {sheet_id: _config_regexes(conf) for sheet_id, conf in SHEET_CONFIGS.items()}
+_DEFAULT_REGEXES = _config_regexes(DEFAULT_CONFIG)
+
+
+def _fast_parse(sheet_id: str, date_str: str):
+    """Parse a date in one of the sheet's known layouts; None if none match"""
+    specialized = SHEET_CONFIGS.get(sheet_id, DEFAULT_CONFIG).get('fast_parse')
+    if specialized:
+        parsed = specialized(date_str)
+        if parsed:
+            return parsed
+    for pattern in _SHEET_REGEXES.get(sheet_id, _DEFAULT_REGEXES):
+        match = pattern.match(date_str)
+        if not match:
+            continue
+        parts = match.groupdict()
+        month = _MONTHS.get(parts['mon'].lower()) if 'mon' in parts else int(parts['m'])
+        if not month:
+            return None
+        hour = minute = second = 0
+        if 'h' in parts:
+            hour = int(parts['h'])
+            if not 1 <= hour <= 12:
+                return None
+            hour = hour % 12 + (12 if parts['ap'].upper() == 'PM' else 0)
+            minute = int(parts['mi'])
+            second = int(parts.get('s') or 0)
+        try:
+            return datetime(int(parts['y']), month, int(parts['d']), hour, minute, second)
+        except ValueError:
+            return None
+    return None
+
+# Sheet rows are cached per sheet so back-to-back commands share one API round-trip.
+_CACHE_TTL = 120  # seconds
+_SHEET_CACHE: dict[tuple[str, str], tuple[float, list[list[str]]]] = {}
+_SHEETS_SERVICE = None
+_SHEETS_CREDS = None
+# httplib2 is not thread-safe, so each worker thread gets its own authorized Http.
+# build_http() keeps the client library's defaults (60 s timeout, redirect codes).
+_THREAD_LOCAL = threading.local()
+
+
+def _get_sheets_service():
+    """Build the Google Sheets service once and reuse it across commands"""
+    global _SHEETS_SERVICE, _SHEETS_CREDS
+    if _SHEETS_SERVICE is None:
+        _SHEETS_CREDS = service_account.Credentials.from_service_account_file(
+            SERVICE_ACCOUNT_JSON,
+            scopes=['https://www.googleapis.com/auth/spreadsheets.readonly'],
+        )
+        _SHEETS_SERVICE = build('sheets', 'v4', credentials=_SHEETS_CREDS)
+    return _SHEETS_SERVICE
+
+
+def _thread_http():
+    """Return the authorized Http bound to the current thread"""
+    http = getattr(_THREAD_LOCAL, 'http', None)
+    if http is None:
+        http = AuthorizedHttp(_SHEETS_CREDS, http=build_http())
+        _THREAD_LOCAL.http = http
+    return http
+
+
+def _fetch_rows(service, sheet_id: str, cell_range: str) -> List[List[str]]:
+    """Fetch the rows of a sheet range from the API, bypassing the cache"""
+    result = service.spreadsheets().values().get(
+        spreadsheetId=sheet_id,
+        range=cell_range,
+    ).execute(http=_thread_http())
+    return result.get('values', [])
+
+
+def _get_rows(service, sheet_id: str, cell_range: str = 'A:Z') -> List[List[str]]:
+    """Return the rows of a sheet range, served from the TTL cache when still fresh"""
+    key = (sheet_id, cell_range)
+    cached = _SHEET_CACHE.get(key)
+    if cached and time.monotonic() - cached[0] < _CACHE_TTL:
+        return cached[1]
+
+    rows = _fetch_rows(service, sheet_id, cell_range)
+    _SHEET_CACHE[key] = (time.monotonic(), rows)
+    return rows
+
+
+def _column_range(last_idx: int) -> str:
+    """Return the A1 range covering columns 0..last_idx, e.g. 5 -> 'A:F'"""
+    letters = ''
+    n = last_idx + 1
+    while n:
+        n, rem = divmod(n - 1, 26)
+        letters = chr(ord('A') + rem) + letters
+    return f'A:{letters}'
+
+
+# Sales lookups only need the name/date/sale columns, so request just those.
+_SHEET_RANGE = {
+    sheet_id: _column_range(max(conf['name_idx'], conf['date_idx'], conf['sale_idx']))
+    for sheet_id, conf in SHEET_CONFIGS.items()
+}
+_DEFAULT_RANGE = _column_range(
+    max(DEFAULT_CONFIG['name_idx'], DEFAULT_CONFIG['date_idx'], DEFAULT_CONFIG['sale_idx'])
+)
+
 
 def calculate_window_days():
     """Calculate days in current sales window (8-17, 18-27, or 28-7)"""
-    today = datetime.utcnow()
-    day = today.day
+    now = datetime.utcnow()
+    day = now.day
     
     if 8 <= day <= 17:
         start_day = 8
@@ -80,12 +343,10 @@ def calculate_window_days():
     elif day >= 28:
         start_day = 28
     else:  # days 1-7: window started on 28th of previous month
-        prev_month = today.replace(day=1) - timedelta(days=1)
-        start = prev_month.replace(day=28, hour=0, minute=0, second=0, microsecond=0)
-        return (today - start).days + 1
+        prev_month_last = now.replace(day=1) - timedelta(days=1)
+        return prev_month_last.day - 28 + 1 + day
     
-    start = today.replace(day=start_day, hour=0, minute=0, second=0, microsecond=0)
-    return (today - start).days + 1
+    return day - start_day + 1
 
 
 def _month_start(dt: datetime) -> datetime:
@@ -94,25 +355,39 @@ def _month_start(dt: datetime) -> datetime:
 
 def get_window_range(window: str) -> tuple[datetime, datetime]:
     """Return start/end datetimes for named windows."""
-    today = datetime.utcnow()
-    this_month_start = _month_start(today)
+    this_month_start = _month_start(datetime.utcnow())
 
     if window == 'first':
-        prev_month_last = this_month_start - timedelta(days=1)
-        start = prev_month_last.replace(day=28, hour=0, minute=0, second=0, microsecond=0)
-        end = this_month_start.replace(day=7, hour=23, minute=59, second=59, microsecond=999999)
+        start = (this_month_start - timedelta(days=1)).replace(day=28)
+        last_offset = 6
     elif window == 'second':
-        start = this_month_start.replace(day=8, hour=0, minute=0, second=0, microsecond=0)
-        end = this_month_start.replace(day=17, hour=23, minute=59, second=59, microsecond=999999)
+        start = this_month_start + timedelta(days=7)
+        last_offset = 16
     elif window == 'third':
-        start = this_month_start.replace(day=18, hour=0, minute=0, second=0, microsecond=0)
-        end = this_month_start.replace(day=27, hour=23, minute=59, second=59, microsecond=999999)
+        start = this_month_start + timedelta(days=17)
+        last_offset = 26
     else:
         raise ValueError(f"Unknown window name: {window}")
 
+    # Window ends at the last microsecond of its final day
+    end = this_month_start + timedelta(days=last_offset, hours=23, minutes=59, seconds=59, microseconds=999999)
     return start, end
 
 
+def _dumps(data) -> bytes:
+    """Serialize compact JSON as UTF-8 bytes, using orjson when installed"""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+def _loads(raw: bytes):
+    """Parse JSON bytes, using orjson when installed"""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
 def ensure_data_dir():
     """Create data directory and users file if they don't exist"""
     os.makedirs(DATA_DIR, exist_ok=True)
@@ -122,20 +397,33 @@ def ensure_data_dir():
 
 
 def load_user_map() -> Dict[str, str]:
-    """Load user ID to name mapping"""
-    ensure_data_dir()
+    """Load user ID to name mapping, reusing the cached copy while the file is unchanged"""
+    global _USER_MAP_CACHE, _USER_MAP_MTIME
     try:
-        with open(USERS_FILE, 'r', encoding='utf-8') as fh:
-            return json.load(fh)
+        mtime = os.stat(USERS_FILE).st_mtime
+    except FileNotFoundError:
+        ensure_data_dir()
+        mtime = os.stat(USERS_FILE).st_mtime
+
+    if _USER_MAP_CACHE is not None and mtime == _USER_MAP_MTIME:
+        return _USER_MAP_CACHE
+
+    try:
+        with open(USERS_FILE, 'rb') as fh:
+            data = _loads(fh.read())
     except (json.JSONDecodeError, FileNotFoundError):
-        return {}
+        data = {}
+    _USER_MAP_CACHE, _USER_MAP_MTIME = data, mtime
+    return data
 
 
 def save_user_map(data: Dict[str, str]):
     """Save user ID to name mapping"""
+    global _USER_MAP_CACHE, _USER_MAP_MTIME
     ensure_data_dir()
-    with open(USERS_FILE, 'w', encoding='utf-8') as fh:
-        json.dump(data, fh, indent=2)
+    with open(USERS_FILE, 'wb') as fh:
+        fh.write(_dumps(data))
+    _USER_MAP_CACHE, _USER_MAP_MTIME = data, os.stat(USERS_FILE).st_mtime
 
 
 def resolve_user_name(telegram_user) -> str:
@@ -147,33 +435,24 @@ def resolve_user_name(telegram_user) -> str:
     return DEFAULT_USER or telegram_user.full_name
 
 
+@lru_cache(maxsize=8192)
 def parse_sheet_date(raw: str):
     """Try multiple date formats to parse sheet date"""
     cleaned = (raw or '').strip()
     
-    # Handle "August 6th, 2025 at 5:52 PM GMT+8" format
-    # Remove timezone info and ordinal suffixes
-    if ' GMT' in cleaned:
-        cleaned = cleaned.split(' GMT')[0].strip()
-    
-    # Replace ordinal suffixes (1st, 2nd, 3rd, 4th, etc.)
-    import re
-    cleaned = re.sub(r'(\d+)(st|nd|rd|th)', r'\1', cleaned)
+    # ISO dates ("2025-11-15", "2025-11-15T17:08:33Z") go straight to the C parser;
+    # any UTC offset is dropped so results stay naive like the other formats
+    if len(cleaned) >= 10 and cleaned[4] == '-' and cleaned[7] == '-':
+        try:
+            return datetime.fromisoformat(cleaned[:19] if len(cleaned) >= 19 else cleaned).replace(tzinfo=None)
+        except ValueError:
+            pass
     
-    candidates = [
-        '%B %d, %Y at %I:%M %p',   # August 6, 2025 at 5:52 PM (after removing "th" and "GMT+8")
-        '%b %d, %Y at %I:%M %p',   # Aug 6, 2025 at 5:52 PM
-        '%b %d, %Y, %I:%M:%S %p',  # Nov 15, 2025, 5:08:33 PM
-        '%B %d, %Y, %I:%M:%S %p',  # November 15, 2025, 5:08:33 PM
-        '%Y-%m-%d',                # 2025-11-15
-        '%Y/%m/%d',                # 2025/11/15
-        '%m/%d/%Y',                # 11/15/2025
-        '%d/%m/%Y',                # 15/11/2025
-        '%Y-%m-%d %H:%M',
-        '%Y/%m/%d %H:%M',
-    ]
+    # Handle "August 6th, 2025 at 5:52 PM GMT+8" format
+    # Remove timezone info and ordinal suffixes (1st, 2nd, 3rd, 4th, etc.)
+    cleaned = _ORDINAL_RE.sub(r'\1', _GMT_RE.sub('', cleaned)).strip()
     
-    for fmt in candidates:
+    for fmt in _FALLBACK_FORMATS:
         try:
             return datetime.strptime(cleaned, fmt)
         except ValueError:
@@ -200,30 +479,239 @@ def parse_sheet_date(raw: str):
     return None
 
 
+@lru_cache(maxsize=8192)
+def _parse_with_config_formats(date_str: str, formats: tuple[str, ...]):
+    """Return the datetime from the first config format that parses, else None"""
+    for fmt in formats:
+        try:
+            return datetime.strptime(date_str, fmt)
+        except ValueError:
+            continue
+    return None
+
+
+# Per-sheet parsed sales stored as parallel numpy arrays (struct of arrays), so the
+# rows are scanned and parsed once per TTL window no matter how many users query
+# them, and each query is a single pass over the arrays.
+_SHEET_INDEX: dict[str, tuple[float, Dict]] = {}
+# datetime64 NaT viewed as int64; sorts before every real timestamp
+_NO_DATE = np.iinfo(np.int64).min
+
+
+def _sum_window_numpy(names, timestamps, amounts, code, lo, hi, samples):
+    """Sum one user's sales between lo and hi in a sheet's index with numpy masks.
+
+    Returns (total, sales, unparsed_amounts, name_matches, unparsed_dates,
+    n_samples); the user's first parsed timestamps are written into ``samples``.
+    """
+    matched = names == code
+    user_ts = timestamps[matched]
+    dated = user_ts != _NO_DATE
+    ts = user_ts[dated]
+    n_samples = min(samples.size, ts.size)
+    samples[:n_samples] = ts[:n_samples]
+    window_amounts = amounts[matched][dated][(ts >= lo) & (ts <= hi)]
+    bad = np.isnan(window_amounts)
+    return (
+        float(window_amounts[~bad].sum()),
+        int(window_amounts.size - bad.sum()),
+        int(bad.sum()),
+        int(user_ts.size),
+        int(user_ts.size - ts.size),
+        n_samples,
+    )
+
+
+def _sum_window_loop(names, timestamps, amounts, code, lo, hi, samples):
+    """Single-pass loop version of _sum_window_numpy, compiled with numba when installed"""
+    total = 0.0
+    sales = 0
+    unparsed_amounts = 0
+    name_matches = 0
+    unparsed_dates = 0
+    n_samples = 0
+    for i in range(names.size):
+        if names[i] != code:
+            continue
+        name_matches += 1
+        ts = timestamps[i]
+        if ts == _NO_DATE:
+            unparsed_dates += 1
+            continue
+        if n_samples < samples.size:
+            samples[n_samples] = ts
+            n_samples += 1
+        if lo <= ts <= hi:
+            if np.isnan(amounts[i]):
+                unparsed_amounts += 1
+            else:
+                total += amounts[i]
+                sales += 1
+    return total, sales, unparsed_amounts, name_matches, unparsed_dates, n_samples
+
+
+# With an explicit signature numba compiles at import, before the bot starts
+# polling, instead of on the first command inside the event loop.
+if njit is not None:
+    _sum_window = njit(
+        'Tuple((float64, int64, int64, int64, int64, int64))'
+        '(int32[:], int64[:], float64[:], int64, int64, int64, int64[:])'
+    )(_sum_window_loop)
+else:
+    _sum_window = _sum_window_numpy
+
+
+def _us_timestamp(dt: datetime) -> int:
+    """Naive datetime -> int64 microseconds, the unit used by the index arrays"""
+    return int(np.datetime64(dt, 'us').astype(np.int64))
+
+
+def _parse_sale_date(sheet_id: str, date_str: str, formats: tuple[str, ...]):
+    """Parse a sheet date cell with the precompiled patterns, then config formats, then fallback.
+
+    The fallback only runs when a 4-digit year is present, since all its formats need one.
+    """
+    return (
+        _fast_parse(sheet_id, date_str)
+        or _parse_with_config_formats(date_str, formats)
+        or (_YEAR_RE.search(date_str) and parse_sheet_date(date_str))
+    )
+
+
+def _index_rows(sheet_id: str, rows: List[List[str]], conf: Dict):
+    """Row-by-row build of (name_codes, name, ts, amt) for small sheets"""
+    sheet_tail = sheet_id[-8:]
+    ni, di, si = conf['name_idx'], conf['date_idx'], conf['sale_idx']
+    max_idx = max(ni, di, si)
+    formats = tuple(conf.get('formats', ()))
+    name_codes: Dict[str, int] = {}
+    name_ids: List[int] = []
+    dates: List[datetime | None] = []
+    amounts: List[float] = []
+
+    # Skip header row
+    for idx, row in enumerate(rows[1:], start=2):
+        if len(row) <= max_idx:
+            continue
+
+        name = row[ni].strip()
+        date_str = row[di].strip()
+        sale_str = row[si].strip()
+        sale_date = _parse_sale_date(sheet_id, date_str, formats)
+
+        # Clean up sale amount
+        clean_sale = sale_str.replace('$', '').replace(',', '').strip()
+        try:
+            amount = float(clean_sale) if clean_sale else 0.0
+        except ValueError:
+            amount = float('nan')
+
+        if _DEBUG_ROWS:
+            logger.debug('Sheet %s, Row %d: "%s" | "%s" -> %s | "%s" -> %s', sheet_tail, idx, name, date_str, sale_date, sale_str, amount)
+        name_ids.append(name_codes.setdefault(name.lower(), len(name_codes)))
+        dates.append(sale_date)
+        amounts.append(amount)
+
+    return (
+        name_codes,
+        np.array(name_ids, dtype=np.int32),
+        np.array(dates, dtype='datetime64[us]').view(np.int64),
+        np.array(amounts, dtype=np.float64),
+    )
+
+
+# When pandas is installed, sheets with more data rows than this are indexed with
+# its column operations; below it the DataFrame setup costs more than the row
+# loop it replaces.
+_VECTORIZE_MIN_ROWS = 10000
+
+
+def _index_rows_vectorized(sheet_id: str, rows: List[List[str]], conf: Dict):
+    """pandas build of (name_codes, name, ts, amt); same result as _index_rows"""
+    ni, di, si = conf['name_idx'], conf['date_idx'], conf['sale_idx']
+    max_idx = max(ni, di, si)
+    formats = tuple(conf.get('formats', ()))
+    df = pd.DataFrame(rows[1:])
+    if df.shape[1] <= max_idx:
+        return {}, np.empty(0, np.int32), np.empty(0, np.int64), np.empty(0, np.float64)
+
+    # Short rows are padded with None by pandas; skip them like the row loop does
+    df = df[df[max_idx].notna()]
+
+    codes, uniques = pd.factorize(df[ni].str.strip().str.lower())
+    name_codes = {name: code for code, name in enumerate(uniques)}
+
+    # Date cells repeat heavily, so each distinct string is parsed only once
+    date_strs = df[di].str.strip()
+    parsed = {value: _parse_sale_date(sheet_id, value, formats) for value in date_strs.unique()}
+    ts = pd.to_datetime(date_strs.map(parsed)).to_numpy('datetime64[us]').view(np.int64)
+
+    clean_sales = df[si].str.replace('[$,]', '', regex=True).str.strip()
+    amounts = pd.to_numeric(clean_sales.replace('', '0'), errors='coerce').to_numpy(np.float64)
+
+    if _DEBUG_ROWS:
+        logger.debug('Sheet %s: indexed %d rows, %d names, %d distinct dates', sheet_id[-8:], len(df), len(name_codes), len(parsed))
+    return name_codes, codes.astype(np.int32), ts, amounts
+
+
+def _get_rows_indexed(service, sheet_id: str, conf: Dict) -> Dict:
+    """Return the parsed sales of a sheet as parallel arrays, cached like _get_rows.
+
+    Keys: ``rows`` (data rows checked), ``name_codes`` (lowercased name -> code),
+    ``name`` (int32 codes), ``ts`` (int64 microseconds, ``_NO_DATE`` when no
+    parser matched) and ``amt`` (float64, NaN when the sale cell is not a number).
+    Arrays keep sheet row order.
+    """
+    cached = _SHEET_INDEX.get(sheet_id)
+    if cached and time.monotonic() - cached[0] < _CACHE_TTL:
+        return cached[1]
+
+    # The index is the cache for sales lookups, so the raw rows are not kept
+    rows = _fetch_rows(service, sheet_id, _SHEET_RANGE.get(sheet_id, _DEFAULT_RANGE))
+    if not rows:
+        logger.warning(f'No data found in sheet {sheet_id}')
+
+    if pd is not None and len(rows) - 1 > _VECTORIZE_MIN_ROWS:
+        name_codes, name_ids, ts, amounts = _index_rows_vectorized(sheet_id, rows, conf)
+    else:
+        name_codes, name_ids, ts, amounts = _index_rows(sheet_id, rows, conf)
+
+    sales = {
+        'rows': max(len(rows) - 1, 0),
+        'name_codes': name_codes,
+        'name': name_ids,
+        'ts': ts,
+        'amt': amounts,
+    }
+    _SHEET_INDEX[sheet_id] = (time.monotonic(), sales)
+    return sales
+
+
 def fetch_sales_from_sheets(
     user_name: str,
     days: int = 1,
     start_date: datetime | None = None,
     end_date: datetime | None = None,
+    sheet_indexes: Dict[str, Dict | Exception] | None = None,
 ) -> Dict[str, float]:
-    """Fetch sales data from Google Sheets for specified user and time period"""
-    if not SERVICE_ACCOUNT_JSON or not os.path.exists(SERVICE_ACCOUNT_JSON):
-        logger.warning('Service account JSON missing; returning dummy data')
-        return {'total': 0.0, 'per_sheet': {}, 'error': 'Service account not configured'}
-    
-    if not service_account or not build:
-        logger.error('google-api-python-client not installed; returning dummy data')
-        return {'total': 0.0, 'per_sheet': {}, 'error': 'Google API client not installed'}
+    """Fetch sales data from Google Sheets for specified user and time period.
+
+    ``sheet_indexes`` lets callers pass results of ``_get_rows_indexed`` that were
+    already built (keyed by sheet ID); sheets missing from it are indexed here.
+    """
+    global _SERVICE_DISABLED_REASON
+    if _SERVICE_DISABLED_REASON:
+        return {'total': 0.0, 'per_sheet': {}, 'error': _SERVICE_DISABLED_REASON}
+
+    if not SHEETS_IDS:
+        return {'total': 0.0, 'per_sheet': {}, 'error': 'No sheets configured (SHEETS_IDS is empty)'}
 
     try:
-        creds = service_account.Credentials.from_service_account_file(
-            SERVICE_ACCOUNT_JSON,
-            scopes=['https://www.googleapis.com/auth/spreadsheets.readonly'],
-        )
-        service = build('sheets', 'v4', credentials=creds)
+        service = _get_sheets_service()
     except Exception as e:
         logger.error(f'Failed to create Google Sheets service: {e}')
-        return {'total': 0.0, 'per_sheet': {}, 'error': f'Authentication error: {str(e)}'}
+        _SERVICE_DISABLED_REASON = f'Authentication error: {str(e)}'
+        return {'total': 0.0, 'per_sheet': {}, 'error': _SERVICE_DISABLED_REASON}
 
     if start_date:
         since = start_date.replace(hour=0, minute=0, second=0, microsecond=0)
@@ -245,89 +733,44 @@ def fetch_sales_from_sheets(
     matching_sales = 0
     sample_dates = []
 
+    user_lower = user_name.lower()
+    since_ts = _us_timestamp(since)
+    until_ts = _us_timestamp(until)
+
     logger.info(f"Searching for user: '{user_name}' since {since.strftime('%Y-%m-%d')} ({days} days)")
 
     for sheet_id in SHEETS_IDS:
         conf = SHEET_CONFIGS.get(sheet_id, DEFAULT_CONFIG)
         
         try:
-            result = service.spreadsheets().values().get(
-                spreadsheetId=sheet_id,
-                range='A:Z',
-            ).execute()
-            rows: List[List[str]] = result.get('values', [])
-            
-            if not rows:
-                logger.warning(f'No data found in sheet {sheet_id}')
+            if sheet_indexes is not None and sheet_id in sheet_indexes:
+                sales = sheet_indexes[sheet_id]
+                if isinstance(sales, Exception):
+                    raise sales
+            else:
+                sales = _get_rows_indexed(service, sheet_id, conf)
+            if not sales['rows']:
                 continue
             
-            logger.info(f'Sheet {sheet_id[-8:]}: Processing {len(rows)-1} data rows')
-            sheet_total = 0.0
-            sheet_sales_count = 0
+            logger.info(f'Sheet {sheet_id[-8:]}: Processing {sales["rows"]} data rows')
+            total_rows += sales['rows']
+
+            samples = np.empty(5 - len(sample_dates), dtype=np.int64)
+            sheet_total, sheet_sales_count, unparsed_amounts, sheet_matches, unparsed_dates, n_samples = _sum_window(
+                sales['name'], sales['ts'], sales['amt'],
+                sales['name_codes'].get(user_lower, -1), since_ts, until_ts, samples,
+            )
+            name_matches += sheet_matches
             
-            # Skip header row
-            for idx, row in enumerate(rows[1:], start=2):
-                total_rows += 1
-                
-                if len(row) <= max(conf['name_idx'], conf['date_idx'], conf['sale_idx']):
-                    continue
-                
-                try:
-                    name = row[conf['name_idx']].strip()
-                    date_str = row[conf['date_idx']].strip()
-                    sale_str = row[conf['sale_idx']].strip()
-                except (IndexError, AttributeError):
-                    continue
-
-                # Check name match first
-                if name.lower() != user_name.lower():
-                    continue
-                    
-                name_matches += 1
-                logger.info(f'Sheet {sheet_id[-8:]}, Row {idx}: Found name match "{name}", date string: "{date_str}"')
-                
-                # Parse date with config formats first, then fallback
-                sale_date = None
-                date_format_used = None
-                for fmt in conf.get('formats', []):
-                    try:
-                        sale_date = datetime.strptime(date_str, fmt)
-                        date_format_used = fmt
-                        logger.info(f'Sheet {sheet_id[-8:]}, Row {idx}: Successfully parsed date "{date_str}" with format "{fmt}"')
-                        break
-                    except ValueError as e:
-                        logger.debug(f'Sheet {sheet_id[-8:]}, Row {idx}: Format "{fmt}" failed for "{date_str}"')
-                        continue
-                
-                if not sale_date:
-                    sale_date = parse_sheet_date(date_str)
-                    if sale_date:
-                        date_format_used = "fallback parser"
-                        logger.info(f'Sheet {sheet_id[-8:]}, Row {idx}: Parsed date "{date_str}" with fallback parser')
-                
-                if not sale_date:
-                    logger.warning(f'Sheet {sheet_id[-8:]}, Row {idx}: ❌ FAILED to parse date "{date_str}" with any format. Tried: {conf.get("formats", [])}')
-                    continue
-                
-                # Store sample dates
-                if len(sample_dates) < 5:
-                    sample_dates.append(sale_date.strftime('%Y-%m-%d'))
-                
-                # Check if this sale matches our criteria
-                if since <= sale_date <= until:
-                    try:
-                        # Clean up sale amount
-                        clean_sale = sale_str.replace('$', '').replace(',', '').strip()
-                        amount = float(clean_sale) if clean_sale else 0.0
-                        sheet_total += amount
-                        matching_sales += 1
-                        sheet_sales_count += 1
-                        logger.info(f'Sheet {sheet_id[-8:]}, Row {idx}: ✓ {name} | {sale_date.strftime("%Y-%m-%d")} | ${amount:.2f}')
-                    except ValueError as e:
-                        logger.warning(f'Sheet {sheet_id[-8:]}, Row {idx}: Could not parse sale amount "{sale_str}": {e}')
-                        continue
-                else:
-                    logger.debug(f'Sheet {sheet_id[-8:]}, Row {idx}: Date {sale_date.strftime("%Y-%m-%d")} is before {since.strftime("%Y-%m-%d")}')
+            # Store sample dates
+            first_dates = samples[:n_samples].astype('datetime64[us]').astype('datetime64[D]')
+            sample_dates.extend(str(d) for d in first_dates)
+
+            if unparsed_dates:
+                logger.warning(f'Sheet {sheet_id[-8:]}: ❌ FAILED to parse {unparsed_dates} dates for {user_name}. Tried: {conf.get("formats", [])}')
+            if unparsed_amounts:
+                logger.warning(f'Sheet {sheet_id[-8:]}: Could not parse {unparsed_amounts} sale amounts for {user_name}')
+            matching_sales += sheet_sales_count
             
             if sheet_total > 0:
                 breakdown[sheet_id] = sheet_total
@@ -352,6 +795,40 @@ def fetch_sales_from_sheets(
     return {'total': totals, 'per_sheet': breakdown, 'debug_info': debug_info}
 
 
+async def fetch_sales_from_sheets_async(
+    user_name: str,
+    days: int = 1,
+    start_date: datetime | None = None,
+    end_date: datetime | None = None,
+) -> Dict[str, float]:
+    """Fetch and index all sheets concurrently off the event loop, then aggregate"""
+    sheet_indexes = None
+    if not _SERVICE_DISABLED_REASON:
+        try:
+            service = _get_sheets_service()
+        except Exception:
+            service = None  # fetch_sales_from_sheets reports the error
+        if service is not None:
+            results = await asyncio.gather(
+                *(
+                    asyncio.to_thread(
+                        _get_rows_indexed, service, sheet_id, SHEET_CONFIGS.get(sheet_id, DEFAULT_CONFIG),
+                    )
+                    for sheet_id in SHEETS_IDS
+                ),
+                return_exceptions=True,
+            )
+            sheet_indexes = dict(zip(SHEETS_IDS, results))
+
+    return fetch_sales_from_sheets(
+        user_name=user_name,
+        days=days,
+        start_date=start_date,
+        end_date=end_date,
+        sheet_indexes=sheet_indexes,
+    )
+
+
 def build_model_breakdown(per_sheet: Dict[str, float]) -> Dict[str, float]:
     """Aggregate sheet totals under friendly model names."""
     totals: Dict[str, float] = {}
@@ -392,27 +869,28 @@ def build_sales_message(user_name: str, data: Dict[str, float], descriptor: str)
     total = data['total']
     debug_info = data.get('debug_info', {})
 
+    parts: List[str] = []
     if total > 0:
-        msg = f"💰 {user_name}'s sales for {descriptor}:\n\n"
-        msg += f"**Total: ${total:.2f}**\n\n"
+        parts.append(f"💰 {user_name}'s sales for {descriptor}:\n\n")
+        parts.append(f"**Total: ${total:.2f}**\n\n")
         if data['per_sheet']:
             model_breakdown = build_model_breakdown(data['per_sheet'])
-            msg += "Breakdown by model:\n"
+            parts.append("Breakdown by model:\n")
             for model in MODEL_NAMES:
-                msg += f"• on {model}: ${model_breakdown.pop(model, 0.0):.2f}\n"
+                parts.append(f"• on {model}: ${model_breakdown.pop(model, 0.0):.2f}\n")
             for leftover_label, amount in model_breakdown.items():
-                msg += f"• on {leftover_label}: ${amount:.2f}\n"
+                parts.append(f"• on {leftover_label}: ${amount:.2f}\n")
         if debug_info:
-            msg += f"\n📊 Debug: {debug_info.get('matching_sales', 0)} sales found"
+            parts.append(f"\n📊 Debug: {debug_info.get('matching_sales', 0)} sales found")
     else:
-        msg = f"📊 {user_name}: No sales found for {descriptor}\n\n"
+        parts.append(f"📊 {user_name}: No sales found for {descriptor}\n\n")
         if debug_info:
-            msg += "Debug info:\n"
-            msg += f"• Total rows checked: {debug_info.get('total_rows', 0)}\n"
-            msg += f"• Rows with your name: {debug_info.get('name_matches', 0)}\n"
-            msg += f"• Date range: {debug_info.get('date_range', 'Unknown')}\n"
-            msg += f"• Sample dates found: {debug_info.get('sample_dates', 'None')}"
-    return msg
+            parts.append("Debug info:\n")
+            parts.append(f"• Total rows checked: {debug_info.get('total_rows', 0)}\n")
+            parts.append(f"• Rows with your name: {debug_info.get('name_matches', 0)}\n")
+            parts.append(f"• Date range: {debug_info.get('date_range', 'Unknown')}\n")
+            parts.append(f"• Sample dates found: {debug_info.get('sample_dates', 'None')}")
+    return ''.join(parts)
 
 
 async def mysales(update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -422,7 +900,7 @@ async def mysales(update: Update, context: ContextTypes.DEFAULT_TYPE):
     
     await update.message.reply_text(f"🔍 Checking sales for {user_name}...")
     
-    data = fetch_sales_from_sheets(user_name=user_name, days=days)
+    data = await fetch_sales_from_sheets_async(user_name=user_name, days=days)
     descriptor = f"the current window ({days} days)"
     await update.message.reply_text(build_sales_message(user_name, data, descriptor))
 
@@ -438,23 +916,14 @@ async def _send_window_sales(update: Update, label: str, start: datetime, end: d
     descriptor = f"{label} window ({start.strftime('%Y-%m-%d')} - {end.strftime('%Y-%m-%d')})"
 
     await update.message.reply_text(f"🔍 Checking {descriptor} for {user_name}...")
-    data = fetch_sales_from_sheets(user_name=user_name, start_date=start, end_date=end)
+    data = await fetch_sales_from_sheets_async(user_name=user_name, start_date=start, end_date=end)
     await update.message.reply_text(build_sales_message(user_name, data, descriptor))
 
 
-async def first_window(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    start, end = get_window_range('first')
-    await _send_window_sales(update, "the 28th-7th", start, end)
-
-
-async def second_window(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    start, end = get_window_range('second')
-    await _send_window_sales(update, "the 8th-17th", start, end)
-
-
-async def third_window(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    start, end = get_window_range('third')
-    await _send_window_sales(update, "the 18th-27th", start, end)
+async def _window_handler(update: Update, context: ContextTypes.DEFAULT_TYPE, *, key: str, label: str):
+    """Handle /first, /second and /third; bound to a window via functools.partial"""
+    start, end = get_window_range(key)
+    await _send_window_sales(update, label, start, end)
 
 
 async def setname(update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -470,7 +939,7 @@ async def setname(update: Update, context: ContextTypes.DEFAULT_TYPE):
         return
     
     name = ' '.join(context.args).strip()
-    user_map = load_user_map()
+    user_map = dict(load_user_map())
     user_map[str(update.effective_user.id)] = name
     save_user_map(user_map)
     
@@ -496,34 +965,24 @@ async def showrow(update: Update, context: ContextTypes.DEFAULT_TYPE):
     
     sheet_id = SHEETS_IDS[sheet_num]
     
-    if not SERVICE_ACCOUNT_JSON or not os.path.exists(SERVICE_ACCOUNT_JSON):
-        await update.message.reply_text("Service account not configured")
+    if _SERVICE_DISABLED_REASON:
+        await update.message.reply_text(_SERVICE_DISABLED_REASON)
         return
     
     try:
-        creds = service_account.Credentials.from_service_account_file(
-            SERVICE_ACCOUNT_JSON,
-            scopes=['https://www.googleapis.com/auth/spreadsheets.readonly'],
-        )
-        sheets_service = build('sheets', 'v4', credentials=creds)
-        
-        result = sheets_service.spreadsheets().values().get(
-            spreadsheetId=sheet_id,
-            range='A:Z',
-        ).execute()
-        rows = result.get('values', [])
+        rows = await asyncio.to_thread(_get_rows, _get_sheets_service(), sheet_id)
         
         if row_num < 1 or row_num > len(rows):
             await update.message.reply_text(f"Row {row_num} not found. Sheet has {len(rows)} rows.")
             return
         
         row = rows[row_num - 1]
-        msg = f"📋 Sheet {sheet_num + 1}, Row {row_num}:\n\n"
+        parts = [f"📋 Sheet {sheet_num + 1}, Row {row_num}:\n\n"]
         
         for i, cell in enumerate(row):
-            msg += f"Column {i}: {cell[:100]}\n"
+            parts.append(f"Column {i}: {cell[:100]}\n")
         
-        await update.message.reply_text(msg)
+        await update.message.reply_text(''.join(parts))
         
     except Exception as e:
         await update.message.reply_text(f"Error: {str(e)}")
@@ -537,7 +996,7 @@ async def testdate(update: Update, context: ContextTypes.DEFAULT_TYPE):
     
     date_str = ' '.join(context.args)
     
-    msg = f"Testing date string: '{date_str}'\n\n"
+    parts = [f"Testing date string: '{date_str}'\n\n"]
     
     # Try all formats
     formats_to_try = ['%b %d, %Y', '%B %d, %Y', '%Y-%m-%d', '%m/%d/%Y', '%d/%m/%Y']
@@ -545,18 +1004,18 @@ async def testdate(update: Update, context: ContextTypes.DEFAULT_TYPE):
     for fmt in formats_to_try:
         try:
             parsed = datetime.strptime(date_str, fmt)
-            msg += f"✓ Format '{fmt}': {parsed.strftime('%Y-%m-%d')}\n"
+            parts.append(f"✓ Format '{fmt}': {parsed.strftime('%Y-%m-%d')}\n")
         except ValueError:
-            msg += f"✗ Format '{fmt}': Failed\n"
+            parts.append(f"✗ Format '{fmt}': Failed\n")
     
     # Try fallback parser
     parsed = parse_sheet_date(date_str)
     if parsed:
-        msg += f"\n✓ Fallback parser: {parsed.strftime('%Y-%m-%d')}"
+        parts.append(f"\n✓ Fallback parser: {parsed.strftime('%Y-%m-%d')}")
     else:
-        msg += f"\n✗ Fallback parser: Failed"
+        parts.append("\n✗ Fallback parser: Failed")
     
-    await update.message.reply_text(msg)
+    await update.message.reply_text(''.join(parts))
 
 
 async def debug(update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -566,52 +1025,46 @@ async def debug(update: Update, context: ContextTypes.DEFAULT_TYPE):
     today = datetime.utcnow()
     since = today - timedelta(days=days - 1)
     
-    msg = "🔧 Debug Information:\n\n"
-    msg += f"User: {user_name}\n"
-    msg += f"Telegram ID: {update.effective_user.id}\n"
-    msg += f"Current date: {today.strftime('%Y-%m-%d')}\n"
-    msg += f"Window: {days} days (since {since.strftime('%Y-%m-%d')})\n"
-    msg += f"Sheets configured: {len(SHEETS_IDS)}\n\n"
+    parts = [
+        "🔧 Debug Information:\n\n",
+        f"User: {user_name}\n",
+        f"Telegram ID: {update.effective_user.id}\n",
+        f"Current date: {today.strftime('%Y-%m-%d')}\n",
+        f"Window: {days} days (since {since.strftime('%Y-%m-%d')})\n",
+        f"Sheets configured: {len(SHEETS_IDS)}\n\n",
+    ]
     
     # Show sheet configs
-    msg += "Sheet Configurations:\n"
+    parts.append("Sheet Configurations:\n")
     for i, sheet_id in enumerate(SHEETS_IDS, 1):
         conf = SHEET_CONFIGS.get(sheet_id, DEFAULT_CONFIG)
-        msg += f"{i}. ...{sheet_id[-8:]}: "
-        msg += f"name=col{conf['name_idx']}, date=col{conf['date_idx']}, sale=col{conf['sale_idx']}\n"
+        parts.append(f"{i}. ...{sheet_id[-8:]}: ")
+        parts.append(f"name=col{conf['name_idx']}, date=col{conf['date_idx']}, sale=col{conf['sale_idx']}\n")
     
-    await update.message.reply_text(msg)
+    await update.message.reply_text(''.join(parts))
     
     # Fetch sample data from sheet 2 specifically (the problematic one)
-    if SERVICE_ACCOUNT_JSON and os.path.exists(SERVICE_ACCOUNT_JSON):
+    if not _SERVICE_DISABLED_REASON:
         try:
-            creds = service_account.Credentials.from_service_account_file(
-                SERVICE_ACCOUNT_JSON,
-                scopes=['https://www.googleapis.com/auth/spreadsheets.readonly'],
-            )
-            sheets_service = build('sheets', 'v4', credentials=creds)
+            sheets_service = _get_sheets_service()
             
             # Focus on sheet 2 (index 1) - the problematic one
             sheet_id = SHEETS_IDS[1]
             conf = SHEET_CONFIGS.get(sheet_id, DEFAULT_CONFIG)
             
             try:
-                result = sheets_service.spreadsheets().values().get(
-                    spreadsheetId=sheet_id,
-                    range='A:Z',
-                ).execute()
-                rows = result.get('values', [])
+                rows = await asyncio.to_thread(_get_rows, sheets_service, sheet_id)
                 
-                sample_msg = f"\n📋 SHEET 2 (...{sheet_id[-8:]}) - Row 47:\n\n"
+                sample_parts = [f"\n📋 SHEET 2 (...{sheet_id[-8:]}) - Row 47:\n\n"]
                 
                 if len(rows) > 47:
                     row = rows[46]  # Row 47 is index 46
                     for i, cell in enumerate(row[:15]):  # Show first 15 columns
-                        sample_msg += f"col{i}: {cell}\n"
+                        sample_parts.append(f"col{i}: {cell}\n")
                 else:
-                    sample_msg += "Row 47 not found"
+                    sample_parts.append("Row 47 not found")
                 
-                await update.message.reply_text(sample_msg)
+                await update.message.reply_text(''.join(sample_parts))
                 
             except Exception as e:
                 await update.message.reply_text(f"\n❌ Error: {str(e)}")
@@ -619,7 +1072,7 @@ async def debug(update: Update, context: ContextTypes.DEFAULT_TYPE):
         except Exception as e:
             await update.message.reply_text(f"\n❌ Error: {str(e)}")
     else:
-        await update.message.reply_text("\n⚠️ Service account not configured")
+        await update.message.reply_text(f"\n⚠️ {_SERVICE_DISABLED_REASON}")
 
 
 def main():
@@ -634,9 +1087,9 @@ def main():
     app.add_handler(CommandHandler('start', start))
     app.add_handler(CommandHandler('mysales', mysales))
     app.add_handler(CommandHandler('week', week))
-    app.add_handler(CommandHandler('first', first_window))
-    app.add_handler(CommandHandler('second', second_window))
-    app.add_handler(CommandHandler('third', third_window))
+    app.add_handler(CommandHandler('first', partial(_window_handler, key='first', label='the 28th-7th')))
+    app.add_handler(CommandHandler('second', partial(_window_handler, key='second', label='the 8th-17th')))
+    app.add_handler(CommandHandler('third', partial(_window_handler, key='third', label='the 18th-27th')))
     app.add_handler(CommandHandler('setname', setname))
     app.add_handler(CommandHandler('debug', debug))
     app.add_handler(CommandHandler('testdate', testdate))